@@ -2,8 +2,10 @@ import sys
 import logging
 import requests
 import signal
+import threading
 import time
 from environs import Env
+from requests.adapters import HTTPAdapter
 from prometheus_client import start_http_server, Gauge, Counter
 
 PROBER_CREATE_USER_SCENARIO_TOTAL = Counter(
@@ -22,6 +24,8 @@ PROBER_CREATE_USER_SCENARIO_DURATION_SECONDS = Gauge(
 env = Env()
 env.read_env()
 
+stop_event = threading.Event()
+
 class Config:
     oncall_exporter_api_url = env("ONCALL_EXPORTER_API_URL")
     oncall_exporter_scrape_interval = env.int("ONCALL_EXPORTER_SCRAPE_INTERVAL", 5)
@@ -33,21 +37,25 @@ class OncallProberClient:
     def __init__(self, config: Config) -> None:
         self.oncall_api_url = config.oncall_exporter_api_url
         self.timeout = config.request_timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        username = 'test_prober_user'
+        self._users_url = f'{self.oncall_api_url}/users'
+        self._delete_url = f'{self.oncall_api_url}/users/{username}'
+        self._body = {"name": username}
 
     def probe(self) -> None:
         PROBER_CREATE_USER_SCENARIO_TOTAL.inc()
-        username = 'test_prober_user'
         start = time.perf_counter()
         success = False
 
         try:
-            create_request = requests.post(
-                f'{self.oncall_api_url}/users', json={"name": username}, timeout=self.timeout
-            )
+            create_request = self.session.post(self._users_url, json=self._body, timeout=self.timeout)
             if create_request.status_code == 200:
-                delete_request = requests.delete(
-                    f'{self.oncall_api_url}/users/{username}', timeout=self.timeout
-                )
+                delete_request = self.session.delete(self._delete_url, timeout=self.timeout)
                 if delete_request.status_code == 200:
                     success = True
         except Exception as e:
@@ -77,13 +85,22 @@ def main():
     start_http_server(config.oncall_exporter_metrics_port)
     client = OncallProberClient(config)
 
-    while True:
-        client.probe()
-        time.sleep(config.oncall_exporter_scrape_interval)
+    next_tick = time.monotonic()
+    try:
+        while not stop_event.is_set():
+            client.probe()
+            next_tick += config.oncall_exporter_scrape_interval
+            now = time.monotonic()
+            if next_tick < now:
+                # Overran the period: skip missed ticks instead of catching up in a burst
+                next_tick = now
+            stop_event.wait(next_tick - now)
+    finally:
+        client.session.close()
 
 def terminate(signal_num, frame):
     print("Terminating")
-    sys.exit(0)
+    stop_event.set()
 
 if __name__ == "__main__":
     signal.signal(signal.SIGTERM, terminate)
@@ -1,6 +1,13 @@
+import re
 import time
+import signal
 import logging
+import functools
+import threading
 import requests
+from typing import Iterable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from prometheus_client import start_http_server, Gauge
 from environs import Env
 
@@ -12,35 +19,84 @@ SCRAPE_INTERVAL = env.int("SLA_SCRAPE_INTERVAL", 10)
 METRICS_PORT = env.int("SLA_METRICS_PORT", 9082)
 REQUEST_TIMEOUT = env.float("REQUEST_TIMEOUT", 2.0)
 
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.1,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=["GET"],
+    ),
+)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+_STOP = threading.Event()
+
 # Основная SLA метрика
 SLA_CURRENT_RATIO = Gauge(
     "sla_current_ratio", "Current SLA ratio of successful runs (success / total)"
 )
 
-def get_counter_value(metric_name: str) -> float:
+@functools.lru_cache(maxsize=32)
+def _get_pattern(metric_names: tuple[str, ...]) -> re.Pattern:
+    return re.compile(
+        rf'({"|".join(map(re.escape, metric_names))})(?:\{{[^}}]*\}})?\s+([0-9.eE+\-]+)\s*'
+    )
+
+def parse_metric_values(lines: Iterable[str], metric_names: tuple[str, ...]) -> dict[str, float]:
+    pattern = _get_pattern(metric_names)
+    values = {}
+    for line in lines:
+        match = pattern.fullmatch(line)
+        if match:
+            values[match.group(1)] = float(match.group(2))
+            if len(values) == len(metric_names):
+                break
+    return values
+
+def get_counter_values(*metric_names: str) -> dict[str, float]:
+    values = dict.fromkeys(metric_names, 0.0)
     try:
-        response = requests.get(PROMETHEUS_URL, timeout=REQUEST_TIMEOUT)
-        for line in response.text.splitlines():
-            if line.startswith(metric_name):
-                return float(line.split()[-1])
+        with _SESSION.get(PROMETHEUS_URL, timeout=REQUEST_TIMEOUT, stream=True) as response:
+            lines = response.iter_lines(decode_unicode=True)
+            values.update(parse_metric_values(lines, metric_names))
     except Exception as e:
-        logging.error(f"Error fetching metric {metric_name}: {e}")
-    return 0.0
+        logging.error(f"Error fetching metrics {', '.join(metric_names)}: {e}")
+    return values
 
 def main():
     logging.basicConfig(level=logging.INFO)
     start_http_server(METRICS_PORT)
     logging.info(f"SLA exporter started on port {METRICS_PORT}")
 
-    while True:
-        total = get_counter_value("prober_create_user_scenario_total")
-        success = get_counter_value("prober_create_user_scenario_success_total")
+    next_tick = time.monotonic()
+    try:
+        while not _STOP.is_set():
+            values = get_counter_values(
+                "prober_create_user_scenario_total", "prober_create_user_scenario_success_total"
+            )
+            total = values["prober_create_user_scenario_total"]
+            success = values["prober_create_user_scenario_success_total"]
+
+            sla_ratio = (success / total) if total > 0 else 0.0
+            SLA_CURRENT_RATIO.set(sla_ratio)
 
-        sla_ratio = (success / total) if total > 0 else 0.0
-        SLA_CURRENT_RATIO.set(sla_ratio)
+            logging.info(f"Current SLA ratio: {sla_ratio:.2f}")
+            next_tick += SCRAPE_INTERVAL
+            now = time.monotonic()
+            if next_tick < now:
+                # Overran the period: skip missed ticks instead of catching up in a burst
+                next_tick = now
+            _STOP.wait(next_tick - now)
+    finally:
+        _SESSION.close()
 
-        logging.info(f"Current SLA ratio: {sla_ratio:.2f}")
-        time.sleep(SCRAPE_INTERVAL)
+def terminate(signal_num, frame):
+    logging.info("Terminating")
+    _STOP.set()
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, terminate)
     main()